@@ -30,6 +30,7 @@ Example usage:
     ```
 """
 
+from ._compat import use_uvloop
 from .client import Client, Connection, ConnectionPool
 from .query import Query, QueryBuilder, QueryResult
 from .exceptions import (
@@ -57,4 +58,5 @@ __all__ = [
     "Row",
     "Column",
     "DataType",
+    "use_uvloop",
 ]
@@ -0,0 +1,125 @@
+"""Optional accelerated dependencies with pure-Python fallbacks"""
+
+import asyncio
+import dataclasses
+import datetime
+import enum
+import json
+import math
+import re
+import uuid
+from typing import Any, Callable, TypeVar, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import uvloop  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # pragma: no cover - only needed by the compiled build
+    _T = TypeVar("_T")
+
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Callable[[_T], _T]:  # type: ignore[misc]
+        """No-op stand-in for ``mypy_extensions.mypyc_attr``"""
+        return lambda cls: cls
+
+
+# Numbers orjson cannot decode exactly: 20 or more digits in a row, or a
+# 19-digit negative number starting with 9, either of which may fall outside
+# the 64-bit range that orjson turns into a (lossy) float. Fraction digits and
+# digits inside strings also match, which only costs a slower, still exact,
+# decode.
+_WIDE_NUMBER = re.compile(rb"\d{20}|-9\d{18}")
+
+
+def _to_json(obj: Any) -> Any:
+    """``default`` hook giving the json module orjson's built-in conversions"""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), default=_to_json).encode()
+
+
+def _stdlib_loads(data: Union[bytes, memoryview]) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether ``obj`` contains a NaN or infinite float at any depth"""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(item) for item in obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(item) for item in obj.values())
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return any(_has_non_finite(getattr(obj, field.name)) for field in dataclasses.fields(obj))
+    return False
+
+
+if orjson is not None:
+    # orjson is only a faster encoder and decoder; wherever its output would
+    # differ from the json module's -- integers beyond 64 bits, non-str dict
+    # keys, NaN and infinities, which orjson writes as null or rejects -- the
+    # json module is used instead, so results do not depend on the backend.
+
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON bytes"""
+        try:
+            data = orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            return _stdlib_dumps(obj)
+        if b"null" in data and _has_non_finite(obj):
+            return _stdlib_dumps(obj)
+        return data
+
+    def json_loads(data: Union[bytes, memoryview]) -> Any:
+        """Deserialize UTF-8 JSON bytes, without an intermediate ``str`` where possible"""
+        if _WIDE_NUMBER.search(data):
+            return _stdlib_loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN, Infinity and out-of-range floats are accepted by json.
+            return _stdlib_loads(data)
+
+else:
+
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON bytes"""
+        return _stdlib_dumps(obj)
+
+    def json_loads(data: Union[bytes, memoryview]) -> Any:
+        """Deserialize UTF-8 JSON bytes"""
+        return _stdlib_loads(data)
+
+
+def use_uvloop() -> bool:
+    """
+    Make uvloop the event loop for loops created from now on.
+
+    The policy only affects new loops, so call this before ``asyncio.run()``.
+    Returns False, leaving the default loop in place, when uvloop is not
+    installed.
+    """
+    if uvloop is None:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
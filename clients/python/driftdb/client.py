@@ -3,91 +3,583 @@ DriftDB Client Implementation
 """
 
 import asyncio
-import json
 import socket
-from typing import Any, Dict, List, Optional, Union
+import struct
+import sys
+import weakref
+from collections import OrderedDict, deque
+from functools import lru_cache
+from operator import itemgetter
+from types import TracebackType
+from typing import (
+    Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Type, Union
+)
 from datetime import datetime
 
+from ._compat import json_dumps, json_loads
 from .exceptions import ConnectionError, QueryError, AuthenticationError, TimeoutError
 from .query import QueryResult
-from .types import Row
+from .types import row_class
+
+
+# Upper bound on how many bytes of queued requests are coalesced into one
+# write. The writer never waits for a batch to fill up -- it sends whatever is
+# queued as soon as the socket is free -- so this only caps how long a burst of
+# pipelined requests can delay the ones queued behind it.
+_MAX_BATCH_BYTES = 64 * 1024
+
+# Wire framings understood by Connection: newline-delimited JSON, or JSON
+# prefixed with its length as a 4-byte little-endian unsigned integer.
+FRAMING_LINE = "line"
+FRAMING_LENGTH = "length"
+
+_LENGTH_HEADER = struct.Struct("<I")
+
+# Prepared statements kept per connection before the least recently used one
+# is released on the server.
+_STATEMENT_CACHE_SIZE = 256
+
+# Prefixes for the prepared statement messages; like query messages, each is
+# completed by one encoded value and the closing brace.
+_PREPARE_PREFIX = b'{"type":"prepare","sql":'
+_DEALLOCATE_PREFIX = b'{"type":"deallocate","stmt_id":'
+
+# A queued query message, kept as its cached prefix (see _query_prefix) and
+# its encoded parameters so that the two are never concatenated, plus the
+# future its response is delivered to.
+_Request = Tuple[bytes, bytes, "asyncio.Future[Dict[str, Any]]"]
+
+# Longest SQL string whose encoding, or time-travel rewrite, is cached.
+# Longer statements usually carry their data inline (bulk INSERTs, generated
+# IN lists) and rarely repeat, and caching them would keep that much memory
+# alive for the life of the process.
+_MAX_CACHED_SQL_LENGTH = 4096
+
+# Closes a query message after its parameters, with and without the newline
+# that terminates it under line framing.
+_MESSAGE_END = b"}"
+_MESSAGE_END_LINE = b"}\n"
+
+
+def _tune_socket(sock: Optional[socket.socket]) -> None:
+    """
+    Configure a connected socket for small request/response messages.
+
+    Nagle's algorithm would hold back sub-MTU queries waiting for an ACK.
+    Keepalive lets idle pooled connections notice a vanished server.
+    """
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError:
+        # Tuning is best-effort; the connection works without it.
+        pass
+
+
+def _weak_callback(method: Callable[..., None]) -> Callable[..., None]:
+    """Wrap a bound method so that the wrapper does not keep its object alive."""
+    ref = weakref.WeakMethod(method)
+
+    def callback(*args: Any) -> None:
+        bound = ref()
+        if bound is not None:
+            bound(*args)
+
+    return callback
+
+
+def _abandon_connection(
+    transport: asyncio.BaseTransport, writer_task: "asyncio.Future[None]"
+) -> None:
+    """Finalizer for connections that were never closed explicitly."""
+    try:
+        writer_task.cancel()
+        transport.close()
+    except RuntimeError:
+        # The event loop is already closed; its sockets went with it.
+        pass
+
+
+class _FrameProtocol(asyncio.Protocol):
+    """
+    Splits the incoming byte stream into frames for a Connection.
+
+    Received data accumulates in a single bytearray that is reused for the
+    life of the connection. Each complete frame is handed to ``on_frame`` as a
+    memoryview into that buffer, so decoding never needs its own copy; the
+    consumer must not keep the view past the call.
+    """
+
+    def __init__(self, framing: str, on_frame: Callable[[memoryview], None],
+                 on_lost: Callable[[Exception], None]):
+        self._framing = framing
+        self._on_frame = on_frame
+        self._on_lost = on_lost
+        self._buffer = bytearray()
+        self._paused = False
+        self._drain_waiter: Optional["asyncio.Future[None]"] = None
+        self._closed: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+        buffer += data
+        consumed = 0
+        with memoryview(buffer) as view:
+            if self._framing == FRAMING_LENGTH:
+                available = len(buffer)
+                while available - consumed >= _LENGTH_HEADER.size:
+                    (length,) = _LENGTH_HEADER.unpack_from(buffer, consumed)
+                    end = consumed + _LENGTH_HEADER.size + length
+                    if end > available:
+                        break
+                    self._on_frame(view[consumed + _LENGTH_HEADER.size:end])
+                    consumed = end
+            else:
+                while True:
+                    end = buffer.find(b"\n", consumed)
+                    if end < 0:
+                        break
+                    self._on_frame(view[consumed:end])
+                    consumed = end + 1
+
+        if consumed:
+            try:
+                del buffer[:consumed]
+            except BufferError:
+                # A frame view outlived its callback; start a fresh buffer
+                # rather than resizing one that is still exported.
+                self._buffer = buffer[consumed:]
+
+    @property
+    def writing_paused(self) -> bool:
+        """Whether the transport's write buffer is above its high-water mark."""
+        return self._paused
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def drain(self) -> None:
+        """Wait until the transport's write buffer is below its high-water mark."""
+        if self._paused:
+            self._drain_waiter = asyncio.get_running_loop().create_future()
+            await self._drain_waiter
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if exc is None:
+            exc = ConnectionError("Connection closed by server")
+        elif not isinstance(exc, ConnectionError):
+            exc = ConnectionError(f"Connection lost: {exc}")
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(exc)
+        self._closed.set_result(None)
+        self._on_lost(exc)
+
+    async def wait_closed(self) -> None:
+        await self._closed
+
+
+async def _write_loop(
+    queue: "asyncio.Queue[_Request]",
+    transport: asyncio.Transport,
+    protocol: _FrameProtocol,
+    length_framed: bool,
+    inflight: Deque["asyncio.Future[Dict[str, Any]]"],
+    on_error: Callable[[Exception], None],
+) -> None:
+    """
+    Drain a connection's send queue, writing each batch with a single flush.
+
+    Sent requests are appended to ``inflight`` to await their responses. The
+    loop is handed only what it needs instead of the Connection itself, so a
+    running writer does not keep an abandoned connection alive.
+    """
+    try:
+        while True:
+            chunks: List[bytes] = []
+            size = 0
+            prefix, params, future = await queue.get()
+            while True:
+                # Callers that gave up before their request was sent
+                # never get a response frame, so skip them entirely.
+                if not future.cancelled():
+                    length = len(prefix) + len(params) + 1
+                    if length_framed:
+                        chunks.append(_LENGTH_HEADER.pack(length))
+                        chunks.append(prefix)
+                        chunks.append(params)
+                        chunks.append(_MESSAGE_END)
+                    else:
+                        chunks.append(prefix)
+                        chunks.append(params)
+                        chunks.append(_MESSAGE_END_LINE)
+                    size += length
+                    inflight.append(future)
+                if size >= _MAX_BATCH_BYTES or queue.empty():
+                    break
+                prefix, params, future = queue.get_nowait()
+
+            if chunks:
+                transport.writelines(chunks)
+                # Only yield for flow control once the transport's buffer
+                # is past its high-water mark; otherwise go straight back
+                # to the queue for the next batch.
+                if protocol.writing_paused:
+                    await protocol.drain()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        on_error(ConnectionError(f"Failed to send to server: {e}"))
 
 
 class Connection:
-    """A single connection to DriftDB server."""
+    """
+    A single connection to DriftDB server.
+
+    Requests from concurrent callers are pipelined: they are queued, written to
+    the socket in batches by a background writer task, and matched to the
+    responses in the order they were sent as frames arrive.
 
-    def __init__(self, host: str, port: int):
+    ``framing`` selects the wire framing: ``"line"`` (newline-delimited JSON,
+    the default) or ``"length"`` (each message prefixed with its byte length
+    as a 4-byte little-endian integer), which needs server support.
+
+    With ``use_prepared`` each distinct SQL string is prepared on the server
+    the first time it runs on this connection, and later executions only send
+    the statement id and parameters. This also needs server support.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        framing: str = FRAMING_LINE,
+        use_prepared: bool = False
+    ):
+        if framing not in (FRAMING_LINE, FRAMING_LENGTH):
+            raise ValueError(f"Unknown framing: {framing!r}")
         self.host = host
         self.port = port
-        self._reader: Optional[asyncio.StreamReader] = None
-        self._writer: Optional[asyncio.StreamWriter] = None
+        self.framing = framing
+        self.use_prepared = use_prepared
+        # SQL -> server statement id, least recently used first
+        self._statements: "OrderedDict[str, Any]" = OrderedDict()
+        self._transport: Optional[asyncio.Transport] = None
+        self._protocol: Optional[_FrameProtocol] = None
         self._connected = False
+        self._send_queue: Optional["asyncio.Queue[_Request]"] = None
+        self._inflight: Deque["asyncio.Future[Dict[str, Any]]"] = deque()
+        self._writer_task: Optional["asyncio.Future[None]"] = None
+        self._finalizer: Optional[weakref.finalize] = None
 
     async def connect(self, timeout: float = 10.0) -> None:
         """Establish connection to DriftDB server."""
+        loop = asyncio.get_running_loop()
         try:
-            self._reader, self._writer = await asyncio.wait_for(
-                asyncio.open_connection(self.host, self.port),
+            transport, protocol = await asyncio.wait_for(
+                loop.create_connection(
+                    lambda: _FrameProtocol(
+                        self.framing,
+                        _weak_callback(self._on_frame),
+                        _weak_callback(self._fail_pending),
+                    ),
+                    self.host,
+                    self.port,
+                ),
                 timeout=timeout
             )
-            self._connected = True
         except asyncio.TimeoutError:
             raise TimeoutError(f"Connection timeout after {timeout}s")
         except Exception as e:
             raise ConnectionError(f"Failed to connect to {self.host}:{self.port}: {e}")
 
+        self._transport, self._protocol = transport, protocol
+        _tune_socket(transport.get_extra_info("socket"))
+
+        self._send_queue = asyncio.Queue()
+        self._writer_task = asyncio.ensure_future(_write_loop(
+            self._send_queue,
+            transport,
+            protocol,
+            self.framing == FRAMING_LENGTH,
+            self._inflight,
+            _weak_callback(self._fail_pending),
+        ))
+        # Stop the writer and close the socket if the connection is dropped
+        # without close(). Neither the protocol nor the writer task holds a
+        # strong reference back to this object, so the finalizer runs as soon
+        # as the last user reference goes away.
+        self._finalizer = weakref.finalize(
+            self, _abandon_connection, transport, self._writer_task
+        )
+        self._connected = True
+
+    async def _request(self, prefix: bytes, params: bytes) -> Dict[str, Any]:
+        """Queue an encoded request and wait for its decoded response."""
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        queue = self._send_queue
+        assert queue is not None
+        queue.put_nowait((prefix, params, future))
+        return await future
+
+    def _on_frame(self, frame: memoryview) -> None:
+        """Resolve the oldest in-flight request with a response frame."""
+        if not self._inflight:
+            self._fail_pending(ConnectionError("Unexpected response from server"))
+            if self._transport is not None:
+                self._transport.close()
+            return
+        future = self._inflight.popleft()
+        if future.done():
+            # The caller was cancelled; nobody is left to decode this for.
+            return
+        try:
+            response = json_loads(frame)
+        except Exception as e:
+            # Malformed JSON, invalid UTF-8 and anything else the decoder
+            # rejects fail this request alone; the future is already off
+            # _inflight, so it must be resolved here.
+            future.set_exception(QueryError(f"Invalid response from server: {e}"))
+        else:
+            future.set_result(response)
+
+    def _fail_pending(self, exc: Exception) -> None:
+        """Mark the connection unusable and fail every outstanding request."""
+        self._connected = False
+        while self._inflight:
+            future = self._inflight.popleft()
+            if not future.done():
+                future.set_exception(exc)
+        if self._send_queue is not None:
+            while not self._send_queue.empty():
+                _, _, future = self._send_queue.get_nowait()
+                if not future.done():
+                    future.set_exception(exc)
+
+    async def _statement_prefix(self, query: str) -> bytes:
+        """Message prefix executing ``query`` as a prepared statement, preparing it if needed."""
+        statements = self._statements
+        stmt_id = statements.get(query)
+        if stmt_id is not None:
+            statements.move_to_end(query)
+            return _exec_prefix(stmt_id)
+
+        response = await self._request(_PREPARE_PREFIX, json_dumps(query))
+        if response.get("type") == "error":
+            raise QueryError(response.get("message", "Unknown error"))
+        stmt_id = response.get("stmt_id")
+        if stmt_id is None:
+            raise QueryError("Invalid prepare response from server")
+
+        if query in statements:
+            # Another caller prepared the same SQL meanwhile; keep theirs.
+            self._deallocate(stmt_id)
+            stmt_id = statements[query]
+        else:
+            statements[query] = stmt_id
+            if len(statements) > _STATEMENT_CACHE_SIZE:
+                _, evicted = statements.popitem(last=False)
+                self._deallocate(evicted)
+        return _exec_prefix(stmt_id)
+
+    def _deallocate(self, stmt_id: Any) -> None:
+        """Release a prepared statement on the server without waiting for it."""
+        if not self._connected or self._send_queue is None:
+            return
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_discard_result)
+        self._send_queue.put_nowait((_DEALLOCATE_PREFIX, json_dumps(stmt_id), future))
+
     async def execute(self, query: str, params: Optional[List[Any]] = None) -> QueryResult:
         """Execute a query and return results."""
         if not self._connected:
             raise ConnectionError("Not connected to server")
 
+        # Send query, built around the cached encoding of its SQL, and wait
+        # for its response
         try:
-            # Build query message
-            message = {
-                "type": "query",
-                "query": query,
-                "params": params or []
-            }
+            if self.use_prepared:
+                prefix = await self._statement_prefix(query)
+            else:
+                prefix = _query_prefix(query)
+            response = await self._request(prefix, json_dumps(params or []))
+        except (ConnectionError, QueryError) as e:
+            raise QueryError(f"Query execution failed: {e}")
 
-            # Send query
-            self._writer.write(json.dumps(message).encode() + b"\n")
-            await self._writer.drain()
+        if response.get("type") == "error":
+            raise QueryError(
+                f"Query execution failed: {response.get('message', 'Unknown error')}"
+            )
 
-            # Read response
-            response_data = await self._reader.readline()
-            response = json.loads(response_data.decode())
+        return _parse_result(response)
 
-            if response.get("type") == "error":
-                raise QueryError(response.get("message", "Unknown error"))
-
-            # Parse result
-            rows = [Row(row) for row in response.get("rows", [])]
-            return QueryResult(
-                rows=rows,
-                row_count=len(rows),
-                columns=response.get("columns", []),
-                execution_time_ms=response.get("execution_time_ms")
-            )
+    async def executemany(
+        self, query: str, params_seq: Iterable[Optional[List[Any]]]
+    ) -> List[QueryResult]:
+        """
+        Execute a query once per parameter list, pipelining every request.
 
-        except json.JSONDecodeError as e:
-            raise QueryError(f"Invalid response from server: {e}")
-        except Exception as e:
-            raise QueryError(f"Query execution failed: {e}")
+        All requests are queued before any response is awaited, so they go out
+        in as few writes as the batch size allows and cost a single round trip
+        rather than one each. Results are returned in input order; if any
+        statement fails, the first error is raised once all have completed.
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected to server")
+
+        if self.use_prepared:
+            try:
+                prefix = await self._statement_prefix(query)
+            except (ConnectionError, QueryError) as e:
+                raise QueryError(f"Query execution failed: {e}")
+        else:
+            prefix = _query_prefix(query)
+
+        # Encode every parameter list before queueing any of them, so that one
+        # that cannot be encoded fails the call without running the others.
+        encoded = [json_dumps(params or []) for params in params_seq]
+
+        queue = self._send_queue
+        assert queue is not None
+        loop = asyncio.get_running_loop()
+        futures: List["asyncio.Future[Dict[str, Any]]"] = []
+        for params_json in encoded:
+            future: "asyncio.Future[Dict[str, Any]]" = loop.create_future()
+            queue.put_nowait((prefix, params_json, future))
+            futures.append(future)
+
+        responses = await asyncio.gather(*futures, return_exceptions=True)
+
+        results = []
+        for response in responses:
+            if isinstance(response, BaseException):
+                raise QueryError(f"Query execution failed: {response}")
+            if response.get("type") == "error":
+                raise QueryError(
+                    f"Query execution failed: {response.get('message', 'Unknown error')}"
+                )
+            results.append(_parse_result(response))
+        return results
 
     async def close(self) -> None:
         """Close the connection."""
-        if self._writer:
-            self._writer.close()
-            await self._writer.wait_closed()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        self._fail_pending(ConnectionError("Connection closed"))
+        if self._finalizer is not None:
+            self._finalizer.detach()
+        if self._transport and self._protocol:
+            self._transport.close()
+            await self._protocol.wait_closed()
         self._connected = False
 
-    def __del__(self):
-        """Cleanup on deletion."""
-        if self._connected and self._writer:
-            try:
-                self._writer.close()
-            except:
-                pass
+
+def _encode_query_prefix(query: str) -> bytes:
+    """
+    Encode the part of a query message that depends only on its SQL.
+
+    Returns ``{"type":"query","query":...,"params":`` so that callers only need
+    to encode the parameters; the writer closes the object.
+    """
+    return json_dumps({"type": "query", "query": query})[:-1] + b',"params":'
+
+
+_cached_query_prefix = lru_cache(maxsize=1024)(_encode_query_prefix)
+
+
+def _query_prefix(query: str) -> bytes:
+    """Encoded query message prefix, cached unless the SQL is too long to keep."""
+    if len(query) > _MAX_CACHED_SQL_LENGTH:
+        return _encode_query_prefix(query)
+    return _cached_query_prefix(query)
+
+
+def _build_sql_at_seq(sql: str, sequence: int) -> str:
+    """Add an AS OF clause for a sequence number to ``sql``."""
+    return "".join((sql, " FOR SYSTEM_TIME AS OF @SEQ:", str(sequence)))
+
+
+def _build_sql_at_time(sql: str, timestamp: Union[str, datetime]) -> str:
+    """Add an AS OF clause for a timestamp to ``sql``."""
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    return "".join((sql, " FOR SYSTEM_TIME AS OF '", timestamp, "'"))
+
+
+_cached_sql_at_seq = lru_cache(maxsize=1024)(_build_sql_at_seq)
+_cached_sql_at_time = lru_cache(maxsize=1024)(_build_sql_at_time)
+
+
+def _sql_at_seq(sql: str, sequence: int) -> str:
+    """``sql`` as of a sequence number, cached like _query_prefix."""
+    if len(sql) > _MAX_CACHED_SQL_LENGTH:
+        return _build_sql_at_seq(sql, sequence)
+    return _cached_sql_at_seq(sql, sequence)
+
+
+def _sql_at_time(sql: str, timestamp: Union[str, datetime]) -> str:
+    """``sql`` as of a timestamp, cached like _query_prefix."""
+    if len(sql) > _MAX_CACHED_SQL_LENGTH:
+        return _build_sql_at_time(sql, timestamp)
+    return _cached_sql_at_time(sql, timestamp)
+
+
+@lru_cache(maxsize=1024)
+def _exec_prefix(stmt_id: Any) -> bytes:
+    """Encode the part of an exec message that depends only on its statement id."""
+    return json_dumps({"type": "exec", "stmt_id": stmt_id})[:-1] + b',"params":'
+
+
+def _discard_result(future: "asyncio.Future[Any]") -> None:
+    """Done callback for requests whose response nobody waits for."""
+    if not future.cancelled():
+        future.exception()
+
+
+def _parse_result(response: Dict[str, Any]) -> QueryResult:
+    """
+    Build a QueryResult from a decoded response message.
+
+    Rows may arrive either as positional value arrays ordered like ``columns``
+    or as column -> value objects. Either way every row ends up holding only
+    its values, sharing one column index built once for the whole result.
+    """
+    raw_rows = response.get("rows") or []
+    columns = response.get("columns") or []
+    object_rows = bool(raw_rows) and isinstance(raw_rows[0], dict)
+    if object_rows and not columns:
+        columns = list(raw_rows[0])
+
+    # Interned names let lookups with literal keys short-circuit on identity.
+    columns = [sys.intern(name) for name in columns]
+    col_index = {name: i for i, name in enumerate(columns)}
+    row_cls = row_class(columns)
+    if not object_rows:
+        rows = [row_cls(values, col_index) for values in raw_rows]
+    elif len(columns) > 1:
+        getter = itemgetter(*columns)
+        try:
+            rows = [row_cls(getter(data), col_index) for data in raw_rows]
+        except KeyError:
+            # Some row omitted a column; fill the gaps with NULL.
+            rows = [row_cls(tuple([data.get(c) for c in columns]), col_index) for data in raw_rows]
+    else:
+        rows = [row_cls(tuple([data.get(c) for c in columns]), col_index) for data in raw_rows]
+
+    return QueryResult(
+        rows=rows,
+        row_count=len(rows),
+        columns=columns,
+        execution_time_ms=response.get("execution_time_ms")
+    )
 
 
 class ConnectionPool:
@@ -110,17 +602,20 @@ class ConnectionPool:
         port: int,
         min_size: int = 2,
         max_size: int = 10,
-        timeout: float = 10.0
+        timeout: float = 10.0,
+        framing: str = FRAMING_LINE,
+        use_prepared: bool = False
     ):
         self.host = host
         self.port = port
         self.min_size = min_size
         self.max_size = max_size
         self.timeout = timeout
+        self.framing = framing
+        self.use_prepared = use_prepared
         self._pool: List[Connection] = []
-        self._available: asyncio.Queue = asyncio.Queue()
+        self._available: "asyncio.Queue[Connection]" = asyncio.Queue(maxsize=max_size)
         self._size = 0
-        self._lock = asyncio.Lock()
 
     async def initialize(self) -> None:
         """Initialize the connection pool."""
@@ -130,27 +625,31 @@ class ConnectionPool:
 
     async def _create_connection(self) -> Connection:
         """Create a new connection."""
-        conn = Connection(self.host, self.port)
-        await conn.connect(self.timeout)
+        # Claim the slot before the first await so that concurrent callers
+        # can never grow the pool past max_size.
         self._size += 1
+        try:
+            conn = Connection(self.host, self.port, self.framing, self.use_prepared)
+            await conn.connect(self.timeout)
+        except BaseException:
+            self._size -= 1
+            raise
         return conn
 
     async def acquire(self) -> Connection:
         """Acquire a connection from the pool."""
+        # Fast path: an idle connection is ready
         try:
-            # Try to get an available connection
-            conn = await asyncio.wait_for(
-                self._available.get(),
-                timeout=1.0
-            )
-            return conn
-        except asyncio.TimeoutError:
-            # Create new connection if under max_size
-            async with self._lock:
-                if self._size < self.max_size:
-                    return await self._create_connection()
-            # Wait for an available connection
-            return await self._available.get()
+            return self._available.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        # Create new connection if under max_size
+        if self._size < self.max_size:
+            return await self._create_connection()
+
+        # Wait for an available connection
+        return await self._available.get()
 
     async def release(self, conn: Connection) -> None:
         """Release a connection back to the pool."""
@@ -158,18 +657,23 @@ class ConnectionPool:
 
     async def close(self) -> None:
         """Close all connections in the pool."""
-        while not self._available.empty():
+        while True:
             try:
-                conn = await asyncio.wait_for(self._available.get(), timeout=0.1)
-                await conn.close()
-            except:
-                pass
+                conn = self._available.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            await conn.close()
 
-    def __aenter__(self):
+    async def __aenter__(self) -> "ConnectionPool":
         """Async context manager entry."""
         return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
         """Async context manager exit."""
         await self.close()
 
@@ -207,7 +711,9 @@ class Client:
         address: str,
         min_connections: int = 2,
         max_connections: int = 10,
-        timeout: float = 10.0
+        timeout: float = 10.0,
+        framing: str = FRAMING_LINE,
+        use_prepared: bool = False
     ) -> "Client":
         """
         Connect to DriftDB server.
@@ -217,6 +723,10 @@ class Client:
             min_connections: Minimum pool size
             max_connections: Maximum pool size
             timeout: Connection timeout in seconds
+            framing: Wire framing, "line" (newline-delimited JSON) or
+                "length" (4-byte little-endian length prefix)
+            use_prepared: Prepare each distinct SQL string on the server and
+                execute it by statement id (requires server support)
 
         Returns:
             Connected Client instance
@@ -229,7 +739,9 @@ class Client:
             port=port,
             min_size=min_connections,
             max_size=max_connections,
-            timeout=timeout
+            timeout=timeout,
+            framing=framing,
+            use_prepared=use_prepared
         )
         await pool.initialize()
 
@@ -276,9 +788,7 @@ class Client:
         Returns:
             QueryResult with historical data
         """
-        # Add AS OF clause
-        time_travel_sql = f"{sql} FOR SYSTEM_TIME AS OF @SEQ:{sequence}"
-        return await self.query(time_travel_sql, params)
+        return await self.query(_sql_at_seq(sql, sequence), params)
 
     async def query_at_time(
         self,
@@ -297,11 +807,7 @@ class Client:
         Returns:
             QueryResult with historical data
         """
-        if isinstance(timestamp, datetime):
-            timestamp = timestamp.isoformat()
-
-        time_travel_sql = f"{sql} FOR SYSTEM_TIME AS OF '{timestamp}'"
-        return await self.query(time_travel_sql, params)
+        return await self.query(_sql_at_time(sql, timestamp), params)
 
     async def execute(self, sql: str, params: Optional[List[Any]] = None) -> int:
         """
@@ -317,6 +823,26 @@ class Client:
         result = await self.query(sql, params)
         return result.row_count
 
+    async def executemany(self, sql: str, params_seq: Iterable[Optional[List[Any]]]) -> int:
+        """
+        Execute a non-query SQL statement once per parameter list.
+
+        The statements are pipelined over a single pooled connection.
+
+        Args:
+            sql: SQL statement
+            params_seq: One parameter list per execution
+
+        Returns:
+            Total number of affected rows
+        """
+        conn = await self._pool.acquire()
+        try:
+            results = await conn.executemany(sql, params_seq)
+        finally:
+            await self._pool.release(conn)
+        return sum(result.row_count for result in results)
+
     def transaction(self) -> "Transaction":
         """
         Start a new transaction.
@@ -330,11 +856,16 @@ class Client:
         """Close all connections."""
         await self._pool.close()
 
-    async def __aenter__(self):
+    async def __aenter__(self) -> "Client":
         """Async context manager entry."""
         return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
         """Async context manager exit."""
         await self.close()
 
@@ -346,15 +877,22 @@ class Transaction:
         self._pool = pool
         self._conn: Optional[Connection] = None
 
-    async def __aenter__(self):
+    async def __aenter__(self) -> "Transaction":
         """Start transaction."""
         self._conn = await self._pool.acquire()
         await self._conn.execute("BEGIN TRANSACTION")
         return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
         """Commit or rollback transaction."""
         try:
+            if self._conn is None:
+                return
             if exc_type is None:
                 await self._conn.execute("COMMIT")
             else:
@@ -369,6 +907,14 @@ class Transaction:
             raise QueryError("Transaction not started")
         return await self._conn.execute(sql, params)
 
+    async def executemany(
+        self, sql: str, params_seq: Iterable[Optional[List[Any]]]
+    ) -> List[QueryResult]:
+        """Execute a query once per parameter list within the transaction."""
+        if not self._conn:
+            raise QueryError("Transaction not started")
+        return await self._conn.executemany(sql, params_seq)
+
     async def commit(self) -> None:
         """Explicitly commit the transaction."""
         if not self._conn:
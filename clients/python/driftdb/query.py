@@ -1,6 +1,8 @@
 """Query building and result handling"""
 
-from typing import Any, Dict, List, Optional, Iterator
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Iterator, Tuple
 from .types import Row, Column
 
 
@@ -67,10 +69,30 @@ class QueryResult:
         """Convert all rows to list of dictionaries"""
         return [row.to_dict() for row in self.rows]
 
+    def column(self, name: str, dtype: Any = None) -> Any:
+        """
+        Get one column as a NumPy array (requires numpy).
+
+        With a ``dtype`` the values are written into a preallocated array of
+        that type as they are read from each row, with no intermediate list;
+        without one numpy infers the dtype from a list of the values.
+        """
+        # Imported here so that ``import driftdb`` does not pay for numpy.
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("QueryResult.column() requires numpy") from None
+        values = map(itemgetter(name), self.rows)
+        if dtype is None:
+            return numpy.array(list(values))
+        return numpy.fromiter(values, dtype=dtype, count=len(self.rows))
+
 
 class Query:
     """Represents a SQL query (for internal use)"""
 
+    __slots__ = ("sql", "params")
+
     def __init__(self, sql: str, params: Optional[List[Any]] = None):
         self.sql = sql
         self.params = params or []
@@ -96,6 +118,16 @@ class QueryBuilder:
         ```
     """
 
+    __slots__ = (
+        "table",
+        "_select_columns",
+        "_where_clauses",
+        "_order_by_clauses",
+        "_limit_value",
+        "_offset_value",
+        "_params",
+    )
+
     def __init__(self, table: str):
         self.table = table
         self._select_columns: List[str] = []
@@ -131,39 +163,58 @@ class QueryBuilder:
         self._offset_value = offset
         return self
 
+    def _shape(self) -> Tuple[Any, ...]:
+        """Everything that determines the SQL text, i.e. all but the param values"""
+        return (
+            self.table,
+            tuple(self._select_columns),
+            tuple([(col, op) for col, op, _ in self._where_clauses]),
+            tuple(self._order_by_clauses),
+            self._limit_value,
+            self._offset_value,
+        )
+
     def build(self) -> str:
         """Build the SQL query string"""
-        # SELECT clause
-        if self._select_columns:
-            columns = ", ".join(self._select_columns)
-        else:
-            columns = "*"
+        return _build_sql(self._shape())
 
-        sql = f"SELECT {columns} FROM {self.table}"
+    def params(self) -> List[Any]:
+        """Get query parameters"""
+        return self._params
 
-        # WHERE clause
-        if self._where_clauses:
-            where_parts = [f"{col} {op} ?" for col, op, _ in self._where_clauses]
-            sql += " WHERE " + " AND ".join(where_parts)
+    def __repr__(self) -> str:
+        return f"QueryBuilder(table={self.table})"
 
-        # ORDER BY clause
-        if self._order_by_clauses:
-            order_parts = [f"{col} {direction}" for col, direction in self._order_by_clauses]
-            sql += " ORDER BY " + ", ".join(order_parts)
 
-        # LIMIT clause
-        if self._limit_value is not None:
-            sql += f" LIMIT {self._limit_value}"
+@lru_cache(maxsize=1024)
+def _build_sql(shape: Tuple[Any, ...]) -> str:
+    """
+    Render the SQL for a QueryBuilder shape.
 
-        # OFFSET clause
-        if self._offset_value is not None:
-            sql += f" OFFSET {self._offset_value}"
+    Builders reused with different parameter values share a shape, so the
+    string is only assembled the first time a shape is seen.
+    """
+    table, select_columns, where_clauses, order_by_clauses, limit, offset = shape
 
-        return sql
+    # SELECT clause
+    parts = ["SELECT ", ", ".join(select_columns) if select_columns else "*", " FROM ", table]
 
-    def params(self) -> List[Any]:
-        """Get query parameters"""
-        return self._params
+    # WHERE clause
+    if where_clauses:
+        parts.append(" WHERE ")
+        parts.append(" AND ".join([f"{col} {op} ?" for col, op in where_clauses]))
 
-    def __repr__(self) -> str:
-        return f"QueryBuilder(table={self.table})"
+    # ORDER BY clause
+    if order_by_clauses:
+        parts.append(" ORDER BY ")
+        parts.append(", ".join([f"{col} {direction}" for col, direction in order_by_clauses]))
+
+    # LIMIT clause
+    if limit is not None:
+        parts.append(f" LIMIT {limit}")
+
+    # OFFSET clause
+    if offset is not None:
+        parts.append(f" OFFSET {offset}")
+
+    return "".join(parts)
@@ -1,8 +1,12 @@
 """Type definitions for DriftDB"""
 
-from typing import Any, Dict, List, Optional
+import keyword
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
 from enum import Enum
 
+from ._compat import mypyc_attr
+
 
 class DataType(Enum):
     """SQL data types supported by DriftDB"""
@@ -14,47 +18,131 @@ class DataType(Enum):
     JSON = "JSON"
 
 
+@mypyc_attr(allow_interpreted_subclasses=True)
 class Row:
-    """A database row with dict-like access"""
+    """
+    A database row with dict-like access.
+
+    Rows from the same result share a single column name -> position mapping
+    and only hold their own values, positionally. Rows returned by queries
+    also expose their columns as attributes (``row.name``) where the column
+    name is an identifier that does not clash with a Row method.
+    """
+
+    __slots__ = ("_values", "_col_index")
 
-    def __init__(self, data: Dict[str, Any]):
-        self._data = data
+    def __init__(self, values: Sequence[Any], col_index: Dict[str, int]):
+        self._values = values
+        self._col_index = col_index
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Row":
+        """Build a standalone row from a column -> value mapping"""
+        return cls(tuple(data.values()), {name: i for i, name in enumerate(data)})
 
     def __getitem__(self, key: str) -> Any:
         """Get column value by name"""
-        return self._data[key]
+        return self._values[self._col_index[key]]
 
     def __contains__(self, key: str) -> bool:
         """Check if column exists"""
-        return key in self._data
+        return key in self._col_index
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get column value with default"""
-        return self._data.get(key, default)
+        index = self._col_index.get(key)
+        return default if index is None else self._values[index]
 
     def keys(self) -> List[str]:
         """Get all column names"""
-        return list(self._data.keys())
+        return list(self._col_index)
 
     def values(self) -> List[Any]:
         """Get all values"""
-        return list(self._data.values())
+        values = self._values
+        return [values[i] for i in self._col_index.values()]
 
     def items(self) -> List[tuple]:
         """Get all (key, value) pairs"""
-        return list(self._data.items())
+        values = self._values
+        return [(name, values[i]) for name, i in self._col_index.items()]
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return self._data.copy()
+        values = self._values
+        return {name: values[i] for name, i in self._col_index.items()}
 
     def __repr__(self) -> str:
-        return f"Row({self._data})"
+        return f"Row({self.to_dict()})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        cls = type(self)
+        values = tuple(self._values)
+        columns = getattr(cls, "_columns", None)
+        if columns is not None and _row_classes.get(columns) is cls:
+            # Generated per-column classes cannot be looked up by name.
+            return (_restore_row, (values, self._col_index, columns))
+        return (cls, (values, self._col_index))
+
+
+# Row subclasses with per-column attributes, keyed by column names
+_row_classes: "weakref.WeakValueDictionary[Tuple[str, ...], Type[Row]]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _restore_row(
+    values: Tuple[Any, ...], col_index: Dict[str, int], columns: Tuple[str, ...]
+) -> Row:
+    """Rebuild a pickled row as an instance of its generated Row subclass"""
+    return row_class(columns)(values, col_index)
+
+
+def row_class(columns: Sequence[str]) -> Type[Row]:
+    """
+    Get the Row subclass for a result with the given columns.
+
+    The subclass stores every column that can be an attribute in a slot of
+    its own, filled once when the row is built, so ``row.name`` is a plain
+    slot read. It is shared by all results with the same column names.
+    """
+    key = tuple(columns)
+    cls = _row_classes.get(key)
+    if cls is None:
+        # Like the shared column index, a repeated name refers to its last column.
+        attributes: Dict[str, int] = {}
+        for index, name in enumerate(key):
+            if (name.isidentifier() and not keyword.iskeyword(name)
+                    and not name.startswith("_") and not hasattr(Row, name)):
+                attributes[name] = index
+        # Only validated identifiers and integers are interpolated into the source.
+        source = "".join(
+            [
+                "def __init__(self, values, col_index):\n",
+                "    self._values = values\n",
+                "    self._col_index = col_index\n",
+            ]
+            + [f"    self.{name} = values[{index}]\n" for name, index in attributes.items()]
+        )
+        namespace: Dict[str, Any] = {}
+        exec(source, namespace)
+        cls = type("Row", (Row,), {
+            "__slots__": tuple(attributes),
+            "__module__": __name__,
+            "__init__": namespace["__init__"],
+            # The key this class is cached under, which col_index alone
+            # cannot recover when a column name repeats.
+            "_columns": key,
+        })
+        _row_classes[key] = cls
+    return cls
 
 
 class Column:
     """Database column metadata"""
 
+    __slots__ = ("name", "data_type", "nullable")
+
     def __init__(self, name: str, data_type: str, nullable: bool = True):
         self.name = name
         self.data_type = data_type
@@ -0,0 +1,20 @@
+"""
+Build script for the DriftDB Python client.
+
+Project metadata lives in pyproject.toml. This file only exists to add the
+optional compiled build: with DRIFTDB_USE_MYPYC=1 set (and mypy installed),
+the row and result types are compiled to a C extension with mypyc. Without
+it the package is pure Python.
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("DRIFTDB_USE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["driftdb/types.py", "driftdb/query.py"])
+
+setup(ext_modules=ext_modules)
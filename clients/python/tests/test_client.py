@@ -0,0 +1,282 @@
+"""Tests for driftdb.client against a loopback server"""
+
+import asyncio
+import json
+import struct
+
+import pytest
+import pytest_asyncio
+
+from driftdb import client as client_module
+from driftdb.client import Connection, ConnectionPool
+from driftdb.exceptions import QueryError
+
+pytestmark = pytest.mark.asyncio
+
+_HEADER = struct.Struct("<I")
+
+
+def _echo(message):
+    """Answer a query with one row holding its parameters"""
+    return {"type": "result", "columns": ["params"], "rows": [[message["params"]]]}
+
+
+class FakeServer:
+    """
+    A loopback DriftDB stand-in that records every message it receives.
+
+    ``respond`` maps a decoded request to the response object, or to raw bytes
+    sent as the frame body verbatim. Responses are written one byte at a time
+    when ``split`` is set, so every frame arrives across many reads, and are
+    held back while ``gate`` is cleared.
+    """
+
+    def __init__(self, framing="line", respond=_echo, split=False):
+        self.framing = framing
+        self.respond = respond
+        self.split = split
+        self.received = []
+        self.connections = 0
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.message_received = asyncio.Event()
+        self._server = None
+        self._writers = []
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        for writer in self._writers:
+            writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def connection(self, **kwargs):
+        conn = Connection("127.0.0.1", self.port, framing=self.framing, **kwargs)
+        await conn.connect()
+        return conn
+
+    async def _read(self, reader):
+        if self.framing == "length":
+            (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+            return await reader.readexactly(length)
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(line, None)
+        return line
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.append(writer)
+        try:
+            while True:
+                message = json.loads(await self._read(reader))
+                self.received.append(message)
+                self.message_received.set()
+                await self.gate.wait()
+                response = self.respond(message)
+                body = response if isinstance(response, bytes) else json.dumps(response).encode()
+                if self.framing == "length":
+                    frame = _HEADER.pack(len(body)) + body
+                else:
+                    frame = body + b"\n"
+                if self.split:
+                    for i in range(len(frame)):
+                        writer.write(frame[i:i + 1])
+                        await writer.drain()
+                        await asyncio.sleep(0)
+                else:
+                    writer.write(frame)
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+@pytest_asyncio.fixture
+async def server():
+    server = FakeServer()
+    await server.start()
+    yield server
+    await server.close()
+
+
+def _params(result):
+    return result[0]["params"]
+
+
+@pytest.mark.parametrize("framing", ["line", "length"])
+async def test_pipelined_responses_match_request_order(framing):
+    server = FakeServer(framing=framing)
+    await server.start()
+    conn = await server.connection()
+
+    results = await asyncio.gather(*[conn.execute("SELECT ?", [i]) for i in range(50)])
+
+    assert [_params(result) for result in results] == [[i] for i in range(50)]
+    await conn.close()
+    await server.close()
+
+
+@pytest.mark.parametrize("framing", ["line", "length"])
+async def test_frames_split_across_reads(framing):
+    server = FakeServer(framing=framing, split=True)
+    await server.start()
+    conn = await server.connection()
+
+    results = await asyncio.gather(*[conn.execute("SELECT ?", [i]) for i in range(3)])
+
+    assert [_params(result) for result in results] == [[0], [1], [2]]
+    await conn.close()
+    await server.close()
+
+
+async def test_undecodable_response_fails_only_its_request(server):
+    server.respond = lambda m: b'{"a":"\xff"}' if m["params"] == [0] else _echo(m)
+    conn = await server.connection()
+
+    bad, good = await asyncio.wait_for(
+        asyncio.gather(
+            conn.execute("SELECT ?", [0]), conn.execute("SELECT ?", [1]), return_exceptions=True
+        ),
+        timeout=5,
+    )
+
+    assert isinstance(bad, QueryError)
+    assert _params(good) == [1]
+    await conn.close()
+
+
+async def test_request_cancelled_before_send_is_skipped(server):
+    conn = await server.connection()
+
+    # The writer only wakes up after this task has yielded, so the request is
+    # still queued when it is cancelled.
+    cancelled = asyncio.ensure_future(conn.execute("SELECT ?", [0]))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    result = await conn.execute("SELECT ?", [1])
+
+    assert cancelled.cancelled()
+    assert [message["params"] for message in server.received] == [[1]]
+    assert _params(result) == [1]
+    await conn.close()
+
+
+async def test_request_cancelled_after_send_does_not_shift_responses(server):
+    conn = await server.connection()
+    server.gate.clear()
+
+    cancelled = asyncio.ensure_future(conn.execute("SELECT ?", [0]))
+    await server.message_received.wait()
+    cancelled.cancel()
+    pending = asyncio.ensure_future(conn.execute("SELECT ?", [1]))
+    await asyncio.sleep(0.01)
+    server.gate.set()
+    result = await pending
+
+    assert len(server.received) == 2
+    assert _params(result) == [1]
+    await conn.close()
+
+
+async def test_pool_growth_is_capped_at_max_size(server):
+    pool = ConnectionPool("127.0.0.1", server.port, min_size=0, max_size=3)
+    await pool.initialize()
+
+    waiters = [asyncio.ensure_future(pool.acquire()) for _ in range(10)]
+    done, _ = await asyncio.wait(waiters, timeout=0.2)
+    assert len(done) == 3
+    assert server.connections == 3
+
+    # Every later waiter is served by a connection handed back by an earlier one.
+    acquired = set()
+    for task in waiters:
+        conn = await task
+        acquired.add(id(conn))
+        await pool.release(conn)
+    assert len(acquired) == 3
+    assert server.connections == 3
+    await pool.close()
+
+
+async def test_executemany_returns_results_in_order(server):
+    conn = await server.connection()
+
+    results = await conn.executemany("INSERT ?", [[i] for i in range(20)])
+
+    assert [_params(result) for result in results] == [[i] for i in range(20)]
+    await conn.close()
+
+
+async def test_executemany_raises_after_every_statement_completes(server):
+    server.respond = lambda m: (
+        {"type": "error", "message": "duplicate key"} if m["params"] == [1] else _echo(m)
+    )
+    conn = await server.connection()
+
+    with pytest.raises(QueryError, match="duplicate key"):
+        await conn.executemany("INSERT ?", [[0], [1], [2]])
+
+    assert [message["params"] for message in server.received] == [[0], [1], [2]]
+    await conn.close()
+
+
+async def test_executemany_encodes_every_parameter_list_before_sending(server):
+    conn = await server.connection()
+
+    with pytest.raises(TypeError):
+        await conn.executemany("INSERT ?", [[0], [object()], [2]])
+
+    # A request sent anyway would be answered first.
+    assert _params(await conn.execute("SELECT ?", [3])) == [3]
+    assert [message["params"] for message in server.received] == [[3]]
+    await conn.close()
+
+
+def _prepared_server(server):
+    """Make ``server`` speak the prepare/exec/deallocate messages"""
+    statements = {}
+
+    def respond(message):
+        if message["type"] == "prepare":
+            stmt_id = len(statements) + 1
+            statements[stmt_id] = message["sql"]
+            return {"type": "prepared", "stmt_id": stmt_id}
+        if message["type"] == "deallocate":
+            return {"type": "ok"}
+        return {"type": "result", "columns": ["sql"], "rows": [[statements[message["stmt_id"]]]]}
+
+    server.respond = respond
+
+
+async def test_prepared_statements_are_reused(server):
+    _prepared_server(server)
+    conn = await server.connection(use_prepared=True)
+
+    first = await conn.execute("SELECT 1")
+    second = await conn.execute("SELECT 1")
+
+    assert first[0]["sql"] == second[0]["sql"] == "SELECT 1"
+    assert [message["type"] for message in server.received] == ["prepare", "exec", "exec"]
+    await conn.close()
+
+
+async def test_least_recently_used_statement_is_deallocated(server, monkeypatch):
+    monkeypatch.setattr(client_module, "_STATEMENT_CACHE_SIZE", 2)
+    _prepared_server(server)
+    conn = await server.connection(use_prepared=True)
+
+    await conn.execute("SELECT 1")
+    await conn.execute("SELECT 2")
+    await conn.execute("SELECT 1")
+    await conn.execute("SELECT 3")
+    result = await conn.execute("SELECT 2")
+
+    deallocated = [m["stmt_id"] for m in server.received if m["type"] == "deallocate"]
+    prepared = [m["sql"] for m in server.received if m["type"] == "prepare"]
+    assert deallocated == [2, 1]
+    assert prepared == ["SELECT 1", "SELECT 2", "SELECT 3", "SELECT 2"]
+    assert result[0]["sql"] == "SELECT 2"
+    await conn.close()
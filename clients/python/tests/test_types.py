@@ -0,0 +1,39 @@
+"""Tests for driftdb.types"""
+
+import pickle
+
+from driftdb.types import Row, row_class
+
+
+def _row(columns, values):
+    return row_class(columns)(values, {name: i for i, name in enumerate(columns)})
+
+
+def test_query_row_pickle_round_trip():
+    row = _row(["id", "name"], [1, "Alice"])
+
+    restored = pickle.loads(pickle.dumps(row))
+
+    assert restored.to_dict() == {"id": 1, "name": "Alice"}
+    assert restored.name == "Alice"
+    assert isinstance(restored, Row)
+
+
+def test_query_row_with_duplicate_columns_pickle_round_trip():
+    columns = ["id", "id", "name"]
+    row = _row(columns, [1, 2, "x"])
+
+    restored = pickle.loads(pickle.dumps(row))
+
+    assert type(restored) is row_class(columns)
+    assert restored["id"] == 2
+    assert restored.name == "x"
+
+
+def test_plain_row_pickle_round_trip():
+    row = Row.from_dict({"id": 1, "name": "Alice"})
+
+    restored = pickle.loads(pickle.dumps(row))
+
+    assert type(restored) is Row
+    assert restored.to_dict() == {"id": 1, "name": "Alice"}
@@ -0,0 +1,26 @@
+"""
+Connection settings shared by the DriftDB integration tests
+"""
+import os
+
+import psycopg2
+
+# Configuration
+DRIFTDB_HOST = os.getenv("DRIFTDB_HOST", "127.0.0.1")
+DRIFTDB_PORT = int(os.getenv("DRIFTDB_PORT", "5433"))
+DRIFTDB_USER = os.getenv("DRIFTDB_USER", "driftdb")
+DRIFTDB_PASS = os.getenv("DRIFTDB_PASS", "driftdb")
+DRIFTDB_DB = os.getenv("DRIFTDB_DB", "driftdb")
+
+
+def connect():
+    """Open an autocommit connection using the DRIFTDB_* settings"""
+    conn = psycopg2.connect(
+        host=DRIFTDB_HOST,
+        port=DRIFTDB_PORT,
+        database=DRIFTDB_DB,
+        user=DRIFTDB_USER,
+        password=DRIFTDB_PASS
+    )
+    conn.autocommit = True
+    return conn
@@ -0,0 +1,12 @@
+"""
+Output helpers shared by the DriftDB integration tests
+"""
+import sys
+
+
+def flush_log(log):
+    """Write buffered subtest output in a single call"""
+    if log:
+        sys.stdout.write("\n".join(log) + "\n")
+        sys.stdout.flush()
+        log.clear()
@@ -0,0 +1,14 @@
+"""
+Shared pytest fixtures for the DriftDB integration tests
+"""
+import pytest
+
+from _db import connect
+
+
+@pytest.fixture(scope="session")
+def driftdb_conn():
+    """Session-scoped autocommit connection shared by the integration tests"""
+    conn = connect()
+    yield conn
+    conn.close()
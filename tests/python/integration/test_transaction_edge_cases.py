@@ -4,300 +4,299 @@ Comprehensive transaction edge case tests for DriftDB
 Tests advanced transaction scenarios, savepoints, nested operations, etc.
 """
 
+import os
 import psycopg2
 import sys
 
-def test_transaction_edge_cases():
-    """Test various transaction edge cases and scenarios"""
+from _db import connect
+from _log import flush_log
+
+# test_transactions.py also uses txn_test; under pytest-xdist give each
+# worker its own table so the two files can run side by side.
+_WORKER = os.getenv("PYTEST_XDIST_WORKER")
+TXN_TABLE = f"txn_test_{_WORKER}" if _WORKER else "txn_test"
 
+# Rows inserted by Test 2: id -> (value, amount)
+SEED = {
+    1: ('first', 100),
+    2: ('second', 200),
+    3: ('third', 300),
+}
+
+def _rollback_quietly(cur):
+    """Roll back a transaction a failed subtest may have left open"""
+    try:
+        cur.execute("ROLLBACK")
+    except psycopg2.Error:
+        pass
+
+def run_transaction_edge_cases(conn):
+    """Run the transaction edge case subtests and return how many failed"""
+
+    log = []
     try:
-        conn = psycopg2.connect(
-            host="127.0.0.1",
-            port=5433,
-            database="driftdb",
-            user="driftdb",
-            password="driftdb"
-        )
-        conn.autocommit = True
         cur = conn.cursor()
-        print("✓ Connected to DriftDB")
 
         # Cleanup
         try:
-            cur.execute("DROP TABLE IF EXISTS txn_test")
+            cur.execute(f"DROP TABLE IF EXISTS {TXN_TABLE}")
         except:
             pass
 
-        cur.execute("""
-            CREATE TABLE txn_test (
+        cur.execute(f"""
+            CREATE TABLE {TXN_TABLE} (
                 id INTEGER PRIMARY KEY,
                 value TEXT,
                 amount INTEGER
             )
         """)
-        print("✓ Created test table")
+        log.append("✓ Created test table")
 
         passed = 0
         failed = 0
 
         # Test 1: Empty transaction (BEGIN then COMMIT without operations)
-        print("\n=== Test 1: Empty transaction ===")
+        log.append("\n=== Test 1: Empty transaction ===")
         try:
             cur.execute("BEGIN")
             cur.execute("COMMIT")
-            print("✓ Empty transaction succeeded")
+            log.append("✓ Empty transaction succeeded")
             passed += 1
         except Exception as e:
-            print(f"✗ Empty transaction failed: {e}")
+            log.append(f"✗ Empty transaction failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 2: Multiple COMMITs (second should be no-op or error gracefully)
-        print("\n=== Test 2: Multiple operations in one transaction ===")
+        log.append("\n=== Test 2: Multiple operations in one transaction ===")
         try:
             cur.execute("BEGIN")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (1, 'first', 100)")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (2, 'second', 200)")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (3, 'third', 300)")
+            for row_id, (value, amount) in SEED.items():
+                cur.execute(
+                    f"INSERT INTO {TXN_TABLE} (id, value, amount) VALUES (%s, %s, %s)",
+                    (row_id, value, amount)
+                )
             cur.execute("COMMIT")
 
-            cur.execute("SELECT COUNT(*) FROM txn_test")
+            cur.execute(f"SELECT COUNT(*) FROM {TXN_TABLE}")
             count = cur.fetchone()[0]
             if count == 3:
-                print(f"✓ Multiple inserts in transaction succeeded (count={count})")
+                log.append(f"✓ Multiple inserts in transaction succeeded (count={count})")
                 passed += 1
             else:
-                print(f"✗ Expected 3 rows, got {count}")
+                log.append(f"✗ Expected 3 rows, got {count}")
                 failed += 1
         except Exception as e:
-            print(f"✗ Multiple operations test failed: {e}")
+            log.append(f"✗ Multiple operations test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 3: ROLLBACK after partial operations
-        print("\n=== Test 3: ROLLBACK after partial operations ===")
+        log.append("\n=== Test 3: ROLLBACK after partial operations ===")
         try:
             cur.execute("BEGIN")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (4, 'fourth', 400)")
-            cur.execute("UPDATE txn_test SET amount = 999 WHERE id = 1")
-            cur.execute("DELETE FROM txn_test WHERE id = 2")
+            cur.execute(f"INSERT INTO {TXN_TABLE} (id, value, amount) VALUES (4, 'fourth', 400)")
+            cur.execute(f"UPDATE {TXN_TABLE} SET amount = 999 WHERE id = 1")
+            cur.execute(f"DELETE FROM {TXN_TABLE} WHERE id = 2")
             cur.execute("ROLLBACK")
 
-            # Verify nothing changed
-            cur.execute("SELECT COUNT(*) FROM txn_test")
-            count = cur.fetchone()[0]
-            cur.execute("SELECT amount FROM txn_test WHERE id = 1")
-            amount = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM txn_test WHERE id = 2")
-            id2_exists = cur.fetchone()[0]
+            # Verify nothing changed (one read of the whole, small table)
+            cur.execute(f"SELECT id, amount FROM {TXN_TABLE}")
+            amounts = dict(cur.fetchall())
+            count = len(amounts)
+            amount = amounts.get(1)
+            id2_exists = int(2 in amounts)
 
             if count == 3 and amount == 100 and id2_exists == 1:
-                print(f"✓ Partial ROLLBACK succeeded (count={count}, amount={amount}, id2_exists={id2_exists})")
+                log.append(f"✓ Partial ROLLBACK succeeded (count={count}, amount={amount}, id2_exists={id2_exists})")
                 passed += 1
             else:
-                print(f"✗ ROLLBACK verification failed: count={count}, amount={amount}, id2_exists={id2_exists}")
+                log.append(f"✗ ROLLBACK verification failed: count={count}, amount={amount}, id2_exists={id2_exists}")
                 failed += 1
         except Exception as e:
-            print(f"✗ Partial ROLLBACK test failed: {e}")
+            log.append(f"✗ Partial ROLLBACK test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 4: Transaction with WHERE clause affecting 0 rows
-        print("\n=== Test 4: Transaction with WHERE affecting 0 rows ===")
+        log.append("\n=== Test 4: Transaction with WHERE affecting 0 rows ===")
         try:
             cur.execute("BEGIN")
-            cur.execute("UPDATE txn_test SET value = 'updated' WHERE id = 999")  # Non-existent
-            cur.execute("DELETE FROM txn_test WHERE id = 888")  # Non-existent
+            cur.execute(f"UPDATE {TXN_TABLE} SET value = 'updated' WHERE id = 999")  # Non-existent
+            cur.execute(f"DELETE FROM {TXN_TABLE} WHERE id = 888")  # Non-existent
             cur.execute("COMMIT")
 
-            cur.execute("SELECT COUNT(*) FROM txn_test")
+            cur.execute(f"SELECT COUNT(*) FROM {TXN_TABLE}")
             count = cur.fetchone()[0]
             if count == 3:
-                print(f"✓ Zero-row operations in transaction succeeded (count={count})")
+                log.append(f"✓ Zero-row operations in transaction succeeded (count={count})")
                 passed += 1
             else:
-                print(f"✗ Expected 3 rows, got {count}")
+                log.append(f"✗ Expected 3 rows, got {count}")
                 failed += 1
         except Exception as e:
-            print(f"✗ Zero-row operations test failed: {e}")
+            log.append(f"✗ Zero-row operations test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 5: Interleaved reads and writes in transaction
-        print("\n=== Test 5: Interleaved reads and writes ===")
+        log.append("\n=== Test 5: Interleaved reads and writes ===")
         try:
             cur.execute("BEGIN")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (10, 'ten', 1000)")
-            cur.execute("SELECT COUNT(*) FROM txn_test")
+            cur.execute(f"INSERT INTO {TXN_TABLE} (id, value, amount) VALUES (10, 'ten', 1000)")
+            cur.execute(f"SELECT COUNT(*) FROM {TXN_TABLE}")
             count_in_txn = cur.fetchone()[0]
-            cur.execute("UPDATE txn_test SET amount = 1001 WHERE id = 10")
-            cur.execute("SELECT amount FROM txn_test WHERE id = 10")
+            cur.execute(f"UPDATE {TXN_TABLE} SET amount = 1001 WHERE id = 10")
+            cur.execute(f"SELECT amount FROM {TXN_TABLE} WHERE id = 10")
             amount_result = cur.fetchone()
             amount_in_txn = amount_result[0] if amount_result else None
             cur.execute("ROLLBACK")
 
-            cur.execute("SELECT COUNT(*) FROM txn_test WHERE id = 10")
+            cur.execute(f"SELECT COUNT(*) FROM {TXN_TABLE} WHERE id = 10")
             count_after = cur.fetchone()[0]
 
             if count_after == 0:
-                print(f"✓ Interleaved operations succeeded (in_txn={count_in_txn}, after_rollback={count_after})")
+                log.append(f"✓ Interleaved operations succeeded (in_txn={count_in_txn}, after_rollback={count_after})")
                 passed += 1
             else:
-                print(f"✗ Row still exists after ROLLBACK")
+                log.append(f"✗ Row still exists after ROLLBACK")
                 failed += 1
         except Exception as e:
-            print(f"✗ Interleaved operations test failed: {e}")
-            # Try to rollback if transaction is active
-            try:
-                cur.execute("ROLLBACK")
-            except:
-                pass
+            log.append(f"✗ Interleaved operations test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 6: UPDATE with complex WHERE clause in transaction
-        print("\n=== Test 6: UPDATE with complex WHERE in transaction ===")
+        log.append("\n=== Test 6: UPDATE with complex WHERE in transaction ===")
         try:
             cur.execute("BEGIN")
-            cur.execute("UPDATE txn_test SET value = 'high' WHERE amount > 150")
+            cur.execute(f"UPDATE {TXN_TABLE} SET value = 'high' WHERE amount > 150")
             cur.execute("ROLLBACK")
 
-            cur.execute("SELECT value FROM txn_test WHERE id = 2")
+            cur.execute(f"SELECT value FROM {TXN_TABLE} WHERE id = 2")
             value = cur.fetchone()[0]
-            if value == 'second':
-                print(f"✓ Complex WHERE UPDATE+ROLLBACK succeeded (value='{value}')")
+            if value == SEED[2][0]:
+                log.append(f"✓ Complex WHERE UPDATE+ROLLBACK succeeded (value='{value}')")
                 passed += 1
             else:
-                print(f"✗ Expected 'second', got '{value}'")
+                log.append(f"✗ Expected '{SEED[2][0]}', got '{value}'")
                 failed += 1
         except Exception as e:
-            print(f"✗ Complex WHERE test failed: {e}")
-            try:
-                cur.execute("ROLLBACK")
-            except:
-                pass
+            log.append(f"✗ Complex WHERE test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 7: Multiple UPDATEs to same row in transaction
-        print("\n=== Test 7: Multiple UPDATEs to same row ===")
+        log.append("\n=== Test 7: Multiple UPDATEs to same row ===")
         try:
             cur.execute("BEGIN")
-            cur.execute("UPDATE txn_test SET amount = 150 WHERE id = 1")
-            cur.execute("UPDATE txn_test SET amount = 160 WHERE id = 1")
-            cur.execute("UPDATE txn_test SET amount = 170 WHERE id = 1")
+            cur.execute(f"UPDATE {TXN_TABLE} SET amount = 150 WHERE id = 1")
+            cur.execute(f"UPDATE {TXN_TABLE} SET amount = 160 WHERE id = 1")
+            cur.execute(f"UPDATE {TXN_TABLE} SET amount = 170 WHERE id = 1")
             cur.execute("COMMIT")
 
-            cur.execute("SELECT amount FROM txn_test WHERE id = 1")
+            cur.execute(f"SELECT amount FROM {TXN_TABLE} WHERE id = 1")
             amount = cur.fetchone()[0]
             if amount == 170:
-                print(f"✓ Multiple UPDATEs succeeded (final amount={amount})")
+                log.append(f"✓ Multiple UPDATEs succeeded (final amount={amount})")
                 passed += 1
             else:
-                print(f"✗ Expected 170, got {amount}")
+                log.append(f"✗ Expected 170, got {amount}")
                 failed += 1
         except Exception as e:
-            print(f"✗ Multiple UPDATEs test failed: {e}")
-            try:
-                cur.execute("ROLLBACK")
-            except:
-                pass
+            log.append(f"✗ Multiple UPDATEs test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 8: DELETE then INSERT same ID in transaction
-        print("\n=== Test 8: DELETE then INSERT same ID ===")
+        log.append("\n=== Test 8: DELETE then INSERT same ID ===")
         try:
             cur.execute("BEGIN")
-            cur.execute("DELETE FROM txn_test WHERE id = 3")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (3, 'new_third', 999)")
+            cur.execute(f"DELETE FROM {TXN_TABLE} WHERE id = 3")
+            cur.execute(f"INSERT INTO {TXN_TABLE} (id, value, amount) VALUES (3, 'new_third', 999)")
             cur.execute("COMMIT")
 
-            cur.execute("SELECT value FROM txn_test WHERE id = 3")
+            cur.execute(f"SELECT value FROM {TXN_TABLE} WHERE id = 3")
             value = cur.fetchone()[0]
             if value == 'new_third':
-                print(f"✓ DELETE+INSERT same ID succeeded (value='{value}')")
+                log.append(f"✓ DELETE+INSERT same ID succeeded (value='{value}')")
                 passed += 1
             else:
-                print(f"✗ Expected 'new_third', got '{value}'")
+                log.append(f"✗ Expected 'new_third', got '{value}'")
                 failed += 1
         except Exception as e:
-            print(f"✗ DELETE+INSERT test failed: {e}")
-            try:
-                cur.execute("ROLLBACK")
-            except:
-                pass
+            log.append(f"✗ DELETE+INSERT test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 9: ROLLBACK of DELETE then INSERT
-        print("\n=== Test 9: ROLLBACK DELETE+INSERT ===")
+        log.append("\n=== Test 9: ROLLBACK DELETE+INSERT ===")
         try:
-            cur.execute("SELECT value FROM txn_test WHERE id = 2")
-            original_value = cur.fetchone()[0]
+            original_value = SEED[2][0]
 
             cur.execute("BEGIN")
-            cur.execute("DELETE FROM txn_test WHERE id = 2")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (2, 'replaced', 777)")
+            cur.execute(f"DELETE FROM {TXN_TABLE} WHERE id = 2")
+            cur.execute(f"INSERT INTO {TXN_TABLE} (id, value, amount) VALUES (2, 'replaced', 777)")
             cur.execute("ROLLBACK")
 
-            cur.execute("SELECT value FROM txn_test WHERE id = 2")
+            cur.execute(f"SELECT value FROM {TXN_TABLE} WHERE id = 2")
             value_after = cur.fetchone()[0]
             if value_after == original_value:
-                print(f"✓ ROLLBACK DELETE+INSERT succeeded (restored to '{value_after}')")
+                log.append(f"✓ ROLLBACK DELETE+INSERT succeeded (restored to '{value_after}')")
                 passed += 1
             else:
-                print(f"✗ Expected '{original_value}', got '{value_after}'")
+                log.append(f"✗ Expected '{original_value}', got '{value_after}'")
                 failed += 1
         except Exception as e:
-            print(f"✗ ROLLBACK DELETE+INSERT test failed: {e}")
-            try:
-                cur.execute("ROLLBACK")
-            except:
-                pass
+            log.append(f"✗ ROLLBACK DELETE+INSERT test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Test 10: Transaction with all DML operations mixed
-        print("\n=== Test 10: Mixed DML operations ===")
+        log.append("\n=== Test 10: Mixed DML operations ===")
         try:
-            cur.execute("SELECT COUNT(*) FROM txn_test")
+            cur.execute(f"SELECT COUNT(*) FROM {TXN_TABLE}")
             initial_count = cur.fetchone()[0]
 
             cur.execute("BEGIN")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (20, 'twenty', 2000)")
-            cur.execute("UPDATE txn_test SET value = 'updated_first' WHERE id = 1")
-            cur.execute("DELETE FROM txn_test WHERE id = 3")
-            cur.execute("INSERT INTO txn_test (id, value, amount) VALUES (21, 'twenty-one', 2100)")
-            cur.execute("UPDATE txn_test SET amount = 999 WHERE id = 2")
+            cur.execute(f"INSERT INTO {TXN_TABLE} (id, value, amount) VALUES (20, 'twenty', 2000)")
+            cur.execute(f"UPDATE {TXN_TABLE} SET value = 'updated_first' WHERE id = 1")
+            cur.execute(f"DELETE FROM {TXN_TABLE} WHERE id = 3")
+            cur.execute(f"INSERT INTO {TXN_TABLE} (id, value, amount) VALUES (21, 'twenty-one', 2100)")
+            cur.execute(f"UPDATE {TXN_TABLE} SET amount = 999 WHERE id = 2")
             cur.execute("COMMIT")
 
-            cur.execute("SELECT COUNT(*) FROM txn_test")
-            final_count = cur.fetchone()[0]
-            cur.execute("SELECT value FROM txn_test WHERE id = 1")
-            value1 = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM txn_test WHERE id = 3")
-            id3_count = cur.fetchone()[0]
-            cur.execute("SELECT amount FROM txn_test WHERE id = 2")
-            amount2 = cur.fetchone()[0]
+            cur.execute(f"SELECT id, value, amount FROM {TXN_TABLE}")
+            rows = {row_id: (value, amount) for row_id, value, amount in cur.fetchall()}
+            final_count = len(rows)
+            value1 = rows[1][0] if 1 in rows else None
+            id3_count = int(3 in rows)
+            amount2 = rows[2][1] if 2 in rows else None
 
             # Verify: count increased by 1 (added 2, deleted 1), value1 updated, id=3 deleted, id=2 amount updated
             if final_count == initial_count + 1 and value1 == 'updated_first' and id3_count == 0 and amount2 == 999:
-                print(f"✓ Mixed DML operations succeeded (count: {initial_count}→{final_count})")
+                log.append(f"✓ Mixed DML operations succeeded (count: {initial_count}→{final_count})")
                 passed += 1
             else:
-                print(f"✗ Mixed DML verification failed:")
-                print(f"   Expected count: {initial_count + 1}, Got: {final_count}")
-                print(f"   Expected value1: 'updated_first', Got: '{value1}'")
-                print(f"   Expected id3_count: 0, Got: {id3_count}")
-                print(f"   Expected amount2: 999, Got: {amount2}")
+                log.append(f"✗ Mixed DML verification failed:")
+                log.append(f"   Expected count: {initial_count + 1}, Got: {final_count}")
+                log.append(f"   Expected value1: 'updated_first', Got: '{value1}'")
+                log.append(f"   Expected id3_count: 0, Got: {id3_count}")
+                log.append(f"   Expected amount2: 999, Got: {amount2}")
                 failed += 1
         except Exception as e:
-            print(f"✗ Mixed DML test failed: {e}")
-            try:
-                cur.execute("ROLLBACK")
-            except:
-                pass
+            log.append(f"✗ Mixed DML test failed: {e}")
+            _rollback_quietly(cur)
             failed += 1
 
         # Cleanup
         try:
-            cur.execute("DROP TABLE IF EXISTS txn_test")
+            cur.execute(f"DROP TABLE IF EXISTS {TXN_TABLE}")
         except:
             pass
 
         # Summary
+        flush_log(log)
         print("\n" + "="*60)
         print(f"Transaction Edge Case Tests Complete")
         print(f"Passed: {passed}/10")
@@ -305,15 +304,24 @@ def test_transaction_edge_cases():
         print("="*60)
 
         cur.close()
-        conn.close()
 
-        return 0 if failed == 0 else 1
+        return failed
 
     except Exception as e:
+        flush_log(log)
         print(f"\n✗ Test suite failed with error: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+        raise
+
+def test_transaction_edge_cases(driftdb_conn):
+    """Test various transaction edge cases and scenarios"""
+    failed = run_transaction_edge_cases(driftdb_conn)
+    assert failed == 0, f"{failed} transaction edge case subtests failed"
 
 if __name__ == "__main__":
-    sys.exit(test_transaction_edge_cases())
+    conn = connect()
+    print("✓ Connected to DriftDB")
+    try:
+        failed = run_transaction_edge_cases(conn)
+    finally:
+        conn.close()
+    sys.exit(0 if failed == 0 else 1)
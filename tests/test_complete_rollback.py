@@ -5,6 +5,7 @@ Tests INSERT, UPDATE, and DELETE buffering in transactions
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
 import sys
 
 def test_complete_rollback():
@@ -41,9 +42,11 @@ def test_complete_rollback():
             )
         """)
 
-        cur.execute("INSERT INTO test_complete (id, name, status) VALUES (1, 'Alice', 'active')")
-        cur.execute("INSERT INTO test_complete (id, name, status) VALUES (2, 'Bob', 'active')")
-        cur.execute("INSERT INTO test_complete (id, name, status) VALUES (3, 'Charlie', 'inactive')")
+        execute_values(cur, "INSERT INTO test_complete (id, name, status) VALUES %s", [
+            (1, 'Alice', 'active'),
+            (2, 'Bob', 'active'),
+            (3, 'Charlie', 'inactive'),
+        ])
         print("✓ Created table with 3 rows")
 
         # Test 1: ROLLBACK prevents INSERT
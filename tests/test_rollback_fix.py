@@ -5,6 +5,7 @@ Verifies that ROLLBACK properly discards DELETE operations
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
 import sys
 
 def test_rollback_fix():
@@ -40,9 +41,11 @@ def test_rollback_fix():
             )
         """)
 
-        cur.execute("INSERT INTO test_rollback (id, name) VALUES (1, 'Alice')")
-        cur.execute("INSERT INTO test_rollback (id, name) VALUES (2, 'Bob')")
-        cur.execute("INSERT INTO test_rollback (id, name) VALUES (3, 'Charlie')")
+        execute_values(cur, "INSERT INTO test_rollback (id, name) VALUES %s", [
+            (1, 'Alice'),
+            (2, 'Bob'),
+            (3, 'Charlie'),
+        ])
         print("✓ Created table with 3 rows")
 
         # Test 1: ROLLBACK should prevent DELETE